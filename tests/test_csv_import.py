@@ -0,0 +1,88 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bunny_breeding_app as app
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(app.DATA_FOLDER)
+    store = app.HerdStore(app.SqliteHerdBackend(os.path.join(app.DATA_FOLDER, "app_data.db")))
+    app.import_bunnies_csv(store, io.StringIO(
+        "id,name,sex\n"
+        "doe1,Clover,Doe\n"
+        "buck1,Basil,Buck\n"
+        "kit1,Pip,Doe\n"))
+    store.put_bunny("kit1", dict(store.get_bunny("kit1"), mom_id="doe1", dad_id="buck1"))
+    store.save()
+    return store
+
+
+def import_bunnies(store, text):
+    return app.import_bunnies_csv(store, io.StringIO(text))
+
+
+def problems_of(store, text):
+    with pytest.raises(app.CsvImportError) as raised:
+        import_bunnies(store, text)
+    return raised.value.problems
+
+
+def test_import_rejects_a_bunny_that_is_its_own_mother(store):
+    problems = problems_of(store, "id,name,sex,mom_id\nself1,Loop,Doe,self1\n")
+    assert len(problems) == 1 and problems[0].startswith("line 2:")
+    assert store.get_bunny("self1") is None
+
+
+def test_import_rejects_a_loop_through_the_herd(store):
+    # Clover would become the kit of her own kit
+    problems = problems_of(store, "id,mom_id\ndoe1,kit1\n")
+    assert len(problems) == 1
+    assert "Clover" in problems[0] and "Pip" in problems[0]
+    assert store.get_bunny("doe1").get("mom_id") is None
+
+
+def test_import_rejects_a_loop_within_the_file(store):
+    problems = problems_of(store, "name,sex,mom\nAda,Doe,Bea\nBea,Doe,Ada\n")
+    assert len(problems) == 1
+    assert store.find_bunny_id("Ada") is None
+
+
+def test_import_leaves_loops_it_did_not_make_alone(store):
+    store.put_bunny("buck1", dict(store.get_bunny("buck1"), dad_id="buck1"))
+    assert store.pedigree_loops() == [["buck1"]]
+    assert import_bunnies(store, "id,color\nkit1,white\n") == (0, 1)
+
+
+def test_import_checks_the_sex_of_parents_given_by_id(store):
+    problems = problems_of(store, "name,sex,mom_id,dad_id\nKit,Doe,buck1,doe1\n")
+    assert problems == ["line 2: mom_id buck1 is a Buck, not a Doe",
+                        "line 2: dad_id doe1 is a Doe, not a Buck"]
+
+
+def test_import_checks_the_sex_of_parents_added_by_the_file(store):
+    problems = problems_of(store, "name,sex,mom\nKit,Doe,Thumper\nThumper,Buck,\n")
+    assert problems == ["line 2: mom 'Thumper' is a Buck, not a Doe"]
+    # the file's sex for a herd bunny is the one that counts
+    problems = problems_of(store, "id,sex,dad_id\nbuck1,Doe,\nkit1,Doe,buck1\n")
+    assert problems == ["line 3: dad_id buck1 is a Doe, not a Buck"]
+
+
+def test_import_accepts_parents_of_the_right_sex(store):
+    added, updated = import_bunnies(store, "name,sex,mom_id,dad\nKit,Doe,doe1,Basil\nJr,Buck,kit1,\n")
+    assert (added, updated) == (2, 0)
+    kit = store.get_bunny(store.find_bunny_id("Kit"))
+    assert (kit["mom_id"], kit["dad_id"]) == ("doe1", "buck1")
+
+
+def test_import_treats_a_repeated_name_as_the_same_bunny(store):
+    problems = problems_of(store, "name,sex\nFluffy,Doe\nFluffy,Buck\n")
+    assert problems == ["line 3: same bunny as line 2"]
+    problems = problems_of(store, "name,color\nClover,white\nClover,grey\n")
+    assert problems == ["line 3: same bunny as line 2"]
+    assert store.find_bunny_id("Fluffy") is None
@@ -0,0 +1,80 @@
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bunny_breeding_app as app
+
+
+@pytest.fixture
+def sqlite_server(tmp_path):
+    db_path = str(tmp_path / "app_data.db")
+    store = app.HerdStore(app.SqliteHerdBackend(db_path))
+    store.put_bunny("doe1", {"name": "Clover", "sex": "Doe", "color": "white", "type": "Rex"})
+    store.put_bunny("buck1", {"name": "Basil", "sex": "Buck", "color": "black", "type": "Rex"})
+    store.add_record({"mom_id": "doe1", "dad_id": "buck1", "date_bred": "2024-01-01",
+                      "is_due": True})
+    store.save()
+
+    server = app.HerdApiServer(("127.0.0.1", 0), app.HerdApi(store), workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, db_path
+    server.shutdown()
+    server.server_close()
+
+
+def get_json(server, path):
+    url = "http://127.0.0.1:%d%s" % (server.server_address[1], path)
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        assert resp.status == 200
+        return json.loads(resp.read())
+
+
+def test_api_serves_sqlite_herd_from_worker_threads(sqlite_server):
+    server, _ = sqlite_server
+    names = sorted(b["name"] for b in get_json(server, "/api/bunnies"))
+    assert names == ["Basil", "Clover"]
+    assert get_json(server, "/api/bunnies/doe1")["name"] == "Clover"
+    assert [rec["date_bred"] for rec in get_json(server, "/api/due")] == ["2024-01-01"]
+    assert "_rev" not in get_json(server, "/api/bunnies/doe1")
+
+
+def test_api_handles_parallel_requests_over_sqlite(sqlite_server):
+    server, _ = sqlite_server
+    paths = ["/api/bunnies", "/api/records", "/api/bunnies/buck1", "/api/unbred"] * 10
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        answers = list(pool.map(lambda p: get_json(server, p), paths))
+    assert len(answers) == len(paths)
+
+
+def test_api_picks_up_saves_from_another_store(sqlite_server):
+    server, db_path = sqlite_server
+    other = app.HerdStore(app.SqliteHerdBackend(db_path))
+    other.put_bunny("kit1", {"name": "Pip", "sex": "Doe", "color": "grey", "type": "Rex",
+                             "mom_id": "doe1", "dad_id": "buck1"})
+    other.save()
+    assert [b["name"] for b in get_json(server, "/api/bunnies/doe1/children")] == ["Pip"]
+
+
+def test_idle_keepalive_connections_free_their_workers(sqlite_server):
+    server, _ = sqlite_server
+    port = server.server_address[1]
+    idle = []
+    for _ in range(4):      # one per worker, each left open after a request
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", "/api/bunnies")
+        conn.getresponse().read()
+        idle.append(conn)
+    started = time.monotonic()
+    assert get_json(server, "/api/bunnies/doe1")["name"] == "Clover"
+    assert time.monotonic() - started < app.SERVER_KEEPALIVE_SECONDS + 1
+    for conn in idle:
+        conn.close()
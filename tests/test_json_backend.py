@@ -0,0 +1,122 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bunny_breeding_app as app
+
+
+def make_backend(tmp_path, **kwargs):
+    return app.JsonHerdBackend(path=str(tmp_path / "app_data.json"),
+                               journal_path=str(tmp_path / "app_data.journal"),
+                               binary_path=str(tmp_path / "app_data.bhs"), **kwargs)
+
+
+def bunny(name, sex="Doe", **fields):
+    return dict({"name": name, "sex": sex, "breeding_history": []}, **fields)
+
+
+def without_revs(data):
+    return {b_id: {k: v for k, v in b.items() if k != "_rev"} for b_id, b in data.items()}
+
+
+def test_saves_append_to_the_journal(tmp_path):
+    store = app.HerdStore(make_backend(tmp_path, use_journal=True))
+    store.put_bunny("b1", bunny("Clover"))
+    store.put_bunny("b2", bunny("Basil", "Buck"))
+    store.save()
+    store.put_bunny("b1", bunny("Clover", color="white"))
+    store.delete_bunny("b2")
+    store.save()
+
+    assert not os.path.exists(tmp_path / "app_data.json")
+    with open(tmp_path / "app_data.journal") as f:
+        ops = [json.loads(line)["op"] for line in f]
+    assert ops.count("put_bunny") == 3 and ops.count("delete_bunny") == 1
+
+    reloaded = app.HerdStore(make_backend(tmp_path, use_journal=True))
+    assert without_revs(reloaded.bunnies()) == {"b1": bunny("Clover", color="white")}
+    assert dict(make_backend(tmp_path).iter_bunnies(fields=("color",))) == {"b1": {"color": "white"}}
+
+
+def test_compact_folds_the_journal_into_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)     # compact() also refreshes bunnies/<id>/profile.json
+    store = app.HerdStore(make_backend(tmp_path, use_journal=True))
+    store.put_bunny("b1", bunny("Clover"))
+    store.save()
+    store.compact()
+    assert not os.path.exists(tmp_path / "app_data.journal")
+    with open(tmp_path / "app_data.json") as f:
+        assert without_revs(json.load(f)["bunnies"]) == {"b1": bunny("Clover")}
+
+
+def test_a_torn_journal_entry_is_dropped_and_the_snapshot_rewritten(tmp_path):
+    store = app.HerdStore(make_backend(tmp_path, use_journal=True))
+    store.put_bunny("b1", bunny("Clover"))
+    store.put_bunny("b2", bunny("Basil", "Buck"))
+    store.save()
+    with open(tmp_path / "app_data.journal", "a") as f:
+        f.write('{"op":"put_bunny","id":"b3","bun')     # crash mid-append
+
+    backend = make_backend(tmp_path, use_journal=True)
+    store = app.HerdStore(backend)
+    assert sorted(store.bunnies()) == ["b1", "b2"]
+    assert backend.needs_snapshot
+    store.put_bunny("b4", bunny("Pip"))
+    store.save()
+    assert not os.path.exists(tmp_path / "app_data.journal")
+    assert sorted(app.HerdStore(make_backend(tmp_path)).bunnies()) == ["b1", "b2", "b4"]
+
+
+def awkward_herd():
+    return {
+        "herd_version": 4,
+        "bunnies": {
+            "b1": bunny("Clover", pedigree=True, weight=2.5, breeding_history=["r1", "r2"]),
+            "b2": bunny("Basil", "Buck", pedigree=1, notes={"vet": ["2024-01-01"]}),
+            "b3": {"name": "Pip"},          # most fields missing
+            "b4": bunny("", dob=None, breeding_history=[["odd"]]),
+        },
+        "breeding_records": {
+            "r1": {"id": "r1", "mom_id": "b1", "dad_id": "b2", "num_born": 0, "is_due": False},
+            "r2": {"id": "r2", "mom_id": "b1", "dad_id": "b2", "num_born": 6, "is_due": True},
+        },
+    }
+
+
+def test_binary_snapshot_round_trips_any_herd(tmp_path):
+    data = awkward_herd()
+    path = str(tmp_path / "app_data.bhs")
+    app.write_binary_snapshot(data, path)
+    back = app.read_binary_snapshot(path)
+    assert back == data
+    # True and 1 are interned apart
+    assert back["bunnies"]["b1"]["pedigree"] is True and back["bunnies"]["b2"]["pedigree"] == 1
+    assert back["bunnies"]["b2"]["pedigree"] is not True
+    assert list(back["bunnies"]) == list(data["bunnies"])
+
+
+def test_binary_backend_loads_the_newer_snapshot(tmp_path):
+    data = awkward_herd()
+    json_backend = make_backend(tmp_path, use_journal=False)
+    json_backend.write_snapshot({"bunnies": {"old": bunny("Old")}})
+    backend = make_backend(tmp_path, use_journal=False, snapshot_format="binary")
+    backend.write_snapshot(data)
+    os.utime(tmp_path / "app_data.json", ns=(1, 1))
+    assert backend.snapshot_path() == str(tmp_path / "app_data.bhs")
+    assert make_backend(tmp_path).load() == data
+    assert dict(backend.iter_bunnies(fields=("name",))) == {
+        b_id: {"name": b["name"]} for b_id, b in data["bunnies"].items()}
+
+    app.export_snapshot_json(str(tmp_path / "app_data.bhs"), str(tmp_path / "app_data.json"))
+    with open(tmp_path / "app_data.json") as f:
+        assert json.load(f) == data
+
+
+def test_read_binary_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "app_data.bhs"
+    path.write_bytes(b"{}")
+    with pytest.raises(ValueError):
+        app.read_binary_snapshot(str(path))
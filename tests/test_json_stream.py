@@ -0,0 +1,56 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bunny_breeding_app as app
+
+DOCS = [
+    '{"a": 2.25}',
+    '{"a": 1e5}',
+    '{"a": -1.5e3}',
+    '{"a": 12345, "b": -0.0, "c": 6.02E+23, "d": 1.5e-7}',
+    '{"a": [1, 2.5, {"b": -3e2}], "c": "x,y}", "d": true, "e": null, "f": 10}',
+    '{"bunnies": {"b1": {"name": "Clover \\"Jr\\"", "weight": 2.75, "breeding_history": [1, 2]}},'
+    ' "herd_version": 17}',
+]
+
+
+def read_members(doc, chunk_size):
+    stream = app.JsonStream(io.StringIO(doc), chunk_size)
+    return {name: stream.value() for name in stream.members()}
+
+
+def skip_members(doc, chunk_size):
+    stream = app.JsonStream(io.StringIO(doc), chunk_size)
+    names = []
+    for name in stream.members():
+        stream.skip_value()
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("doc", DOCS)
+def test_numbers_split_across_chunks(doc):
+    for chunk_size in range(1, len(doc) + 2):
+        assert read_members(doc, chunk_size) == json.loads(doc), chunk_size
+        assert skip_members(doc, chunk_size) == list(json.loads(doc)), chunk_size
+
+
+def test_iter_json_bunnies_over_many_chunks(tmp_path):
+    data = {"herd_version": 3,
+            "bunnies": {"b%d" % n: {"name": "Bunny %d" % n, "sex": "Doe" if n % 2 else "Buck",
+                                    "weight": n / 7.0, "score": -n * 1e-3,
+                                    "breeding_history": ["r%d" % k for k in range(n % 5)]}
+                        for n in range(3000)},
+            "breeding_records": {}}
+    path = tmp_path / "app_data.json"
+    path.write_text(json.dumps(data, indent=4))
+    assert os.path.getsize(path) > 3 * app.STREAM_CHUNK_SIZE
+    assert dict(app.iter_json_bunnies(str(path))) == data["bunnies"]
+    projected = dict(app.iter_json_bunnies(str(path), fields=("name", "weight")))
+    assert projected == {b_id: {"name": b["name"], "weight": b["weight"]}
+                         for b_id, b in data["bunnies"].items()}
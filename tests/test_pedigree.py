@@ -0,0 +1,221 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bunny_breeding_app as app
+
+
+def random_herd(seed, size=120, founders=12):
+    """{id: bunny} in birth order; some parents unknown or no longer in the herd."""
+    rng = random.Random(seed)
+    herd = {}
+    for n in range(size):
+        b_id = "b%d" % n
+        bunny = {"name": b_id, "sex": rng.choice(["Doe", "Buck"])}
+        if n >= founders:
+            does = [k for k, b in herd.items() if b["sex"] == "Doe"]
+            bucks = [k for k, b in herd.items() if b["sex"] == "Buck"]
+            # mostly recent parents, so lines close up and F is not trivial
+            bunny["mom_id"] = rng.choice(does[-8:]) if does and rng.random() < 0.9 else None
+            bunny["dad_id"] = rng.choice(bucks[-8:]) if bucks and rng.random() < 0.9 else None
+            if rng.random() < 0.05:
+                bunny["dad_id"] = "gone%d" % n
+        herd[b_id] = bunny
+    return herd
+
+
+def tabular_a(herd):
+    """The additive relationship matrix the slow, textbook way (oldest first)."""
+    order = list(herd)
+    a = {}
+    for i, b_id in enumerate(order):
+        mom = herd[b_id].get("mom_id")
+        dad = herd[b_id].get("dad_id")
+        mom = mom if mom in herd else None
+        dad = dad if dad in herd else None
+        for other in order[:i]:
+            value = 0.5 * ((a[(mom, other)] if mom else 0.0) + (a[(dad, other)] if dad else 0.0))
+            a[(b_id, other)] = a[(other, b_id)] = value
+        a[(b_id, b_id)] = 1.0 + (0.5 * a[(mom, dad)] if mom and dad else 0.0)
+    return a
+
+
+def graph_of(herd):
+    return app.PedigreeGraph(herd.items())
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_coi_matches_tabular_method(seed):
+    herd = random_herd(seed)
+    a = tabular_a(herd)
+    graph = graph_of(herd)
+    coi = graph.coi_all()
+    for b_id in herd:
+        assert coi[b_id] == pytest.approx(a[(b_id, b_id)] - 1.0, abs=1e-12)
+        assert graph.coi(b_id) == pytest.approx(a[(b_id, b_id)] - 1.0, abs=1e-12)
+    assert max(coi.values()) > 0.1
+
+
+@pytest.mark.parametrize("seed", [4, 5])
+def test_relationship_and_pair_coi_match_tabular_method(seed):
+    herd = random_herd(seed, size=80)
+    a = tabular_a(herd)
+    graph = graph_of(herd)
+    rng = random.Random(seed)
+    ids = list(herd)
+    for _ in range(200):
+        x, y = rng.choice(ids), rng.choice(ids)
+        expected = a[(x, y)] / (a[(x, x)] * a[(y, y)]) ** 0.5
+        assert graph.relationship(x, y) == pytest.approx(expected, abs=1e-12)
+        assert graph.pair_coi(x, y) == pytest.approx(0.5 * a[(x, y)], abs=1e-12)
+
+
+def test_coi_follows_reparenting():
+    herd = random_herd(6)
+    graph = graph_of(herd)
+    graph.coi_all()     # fill the memos, then change parents under them
+    rng = random.Random(6)
+    ids = list(herd)
+    for _ in range(15):
+        n = rng.randrange(20, len(ids))
+        earlier = ids[:n]
+        b_id = ids[n]
+        herd[b_id]["mom_id"] = rng.choice(earlier)
+        herd[b_id]["dad_id"] = rng.choice(earlier)
+        graph.set_parents(b_id, herd[b_id]["mom_id"], herd[b_id]["dad_id"])
+        a = tabular_a(herd)
+        coi = graph.coi_all()
+        for other in herd:
+            assert coi[other] == pytest.approx(a[(other, other)] - 1.0, abs=1e-12)
+
+
+def test_coi_of_looping_pedigree_is_none():
+    herd = {"a": {"mom_id": "b"}, "b": {"mom_id": "a", "dad_id": "c"},
+            "c": {}, "d": {"mom_id": "a", "dad_id": "c"}}
+    graph = graph_of(herd)
+    assert graph.coi("a") is None
+    assert graph.coi("d") is None
+    assert graph.coi("c") == 0.0
+    assert graph.relationship("a", "c") is None
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_pair_coi_matrix_matches_pair_coi(use_numpy, monkeypatch):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    herd = random_herd(7, size=150)
+    graph = graph_of(herd)
+    does = [k for k, b in herd.items() if b["sex"] == "Doe"][-25:]
+    bucks = [k for k, b in herd.items() if b["sex"] == "Buck"][-25:] + ["gone140"]
+    matrix = graph.pair_coi_matrix(does, bucks)
+    assert len(matrix) == len(does) * len(bucks)
+    for (mom, dad), f in matrix.items():
+        assert f == pytest.approx(graph_of(herd).pair_coi(mom, dad), abs=1e-12)
+
+
+def test_pair_coi_matrix_leaves_unknown_ids_alone():
+    graph = graph_of(random_herd(8, size=60))
+    slots = len(graph.ids)
+    matrix = graph.pair_coi_matrix(["b30", "nobody"], ["b31", "nobody either"])
+    assert len(graph.ids) == slots
+    assert matrix[("nobody", "b31")] == 0.0
+    assert matrix[("b30", "nobody either")] == 0.0
+    assert matrix[("b30", "b31")] == graph.pair_coi("b30", "b31")
+
+
+def sqlite_store(path, herd=None):
+    store = app.HerdStore(app.SqliteHerdBackend(str(path)))
+    for b_id, bunny in (herd or {}).items():
+        store.put_bunny(b_id, dict(bunny))
+    store.save()
+    return store
+
+
+def test_store_keeps_pedigree_across_reloads(tmp_path):
+    herd = random_herd(9, size=80)
+    store = sqlite_store(tmp_path / "app_data.db", herd)
+    graph = store.pedigree()
+    graph.coi_all()
+
+    other = sqlite_store(tmp_path / "app_data.db")
+    moved = dict(other.get_bunny("b70"), mom_id="b60", dad_id="b61")
+    other.put_bunny("b70", moved)
+    other.delete_bunny("b75")
+    other.save()
+    herd["b70"].update(mom_id="b60", dad_id="b61")
+    del herd["b75"]
+
+    assert store.is_stale()
+    store.get_data()
+    assert store.pedigree() is graph
+    a = tabular_a(herd)
+    for b_id in herd:
+        assert store.coi(b_id) == pytest.approx(a[(b_id, b_id)] - 1.0, abs=1e-12)
+    assert graph.moms[graph.slots["b75"]] == -1
+
+
+def test_store_warms_pedigree_in_background(tmp_path):
+    herd = random_herd(10, size=80)
+    store = sqlite_store(tmp_path / "app_data.db", herd)
+    store.warm_pedigree()
+    # an edit made while the thread works is applied when the graph is taken over
+    store.put_bunny("b79", dict(store.get_bunny("b79"), mom_id="b70", dad_id="b71"))
+    herd["b79"].update(mom_id="b70", dad_id="b71")
+    graph = store.pedigree()
+    assert store.poll_pedigree()
+    a = tabular_a(herd)
+    for b_id in herd:
+        assert store.coi(b_id) == pytest.approx(a[(b_id, b_id)] - 1.0, abs=1e-12)
+    assert store.pedigree() is graph
+
+
+def test_find_cycles_reports_each_loop_once():
+    herd = random_herd(11, size=60)
+    assert graph_of(herd).find_cycles() == []
+    herd["b20"]["mom_id"] = "b40"       # b40 descends from b20 in this herd
+    herd["b5"]["dad_id"] = "b5"
+    assert "b20" in graph_of(herd).ancestors("b40")
+    cycles = graph_of(herd).find_cycles()
+    assert ["b5"] in cycles
+    assert len(cycles) >= 2
+    for cycle in cycles:
+        graph = graph_of(herd)
+        for kit, parent in zip(cycle, cycle[1:] + cycle[:1]):
+            assert parent in (herd[kit].get("mom_id"), herd[kit].get("dad_id"))
+        assert graph.coi(cycle[0]) is None
+
+
+def lines_of_descent(herd, b_id, depth=1):
+    """Every (ancestor, generations back) reached along each line, the slow way."""
+    out = []
+    for side in ("mom_id", "dad_id"):
+        p = herd.get(b_id, {}).get(side)
+        if p:
+            out.append((p, depth))
+            out.extend(lines_of_descent(herd, p, depth + 1))
+    return out
+
+
+@pytest.mark.parametrize("seed", [12, 13])
+def test_ancestor_paths_keeps_every_line(seed):
+    herd = random_herd(seed, size=50)
+    graph = graph_of(herd)
+    for b_id in list(herd)[-10:]:
+        expected = {}
+        for p, depth in lines_of_descent(herd, b_id):
+            expected.setdefault(p, []).append(depth)
+        paths = graph.ancestor_paths(b_id)
+        assert {p: sorted(d) for p, d in paths.items()} == {p: sorted(d) for p, d in expected.items()}
+        assert set(paths) == graph.ancestors(b_id)
+    assert any(len(d) > 1 for d in graph.ancestor_paths(list(herd)[-1]).values())
+
+
+def test_ancestor_paths_refuses_a_loop():
+    graph = graph_of({"a": {"mom_id": "b"}, "b": {"dad_id": "a"}})
+    with pytest.raises(ValueError):
+        graph.ancestor_paths("a")